@@ -5,17 +5,270 @@ Simple web server for the control dashboard interface
 """
 
 import os
-import json
+import errno
 import time
+import socket
+import gzip
+import mimetypes
+import email.utils
+import signal
+import queue
 import threading
 import subprocess
-from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import traceback
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import socketserver
 import webbrowser
+import functools
+
+# Prefer orjson for response encoding (returns bytes directly), falling back
+# to ujson and then the standard library when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, default=str)
+except ImportError:
+    try:
+        # ujson only accepts default= from 5.4; payloads are plain JSON types
+        import ujson
+
+        def _dumps(obj):
+            return ujson.dumps(obj).encode()
+    except ImportError:
+        import json
+
+        def _dumps(obj):
+            return json.dumps(obj, default=str).encode()
+
+# Persistent descriptors for the /proc probes; None where procfs is missing
+def _open_proc(path):
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+_UPTIME_FD = _open_proc('/proc/uptime')
+_LOADAVG_FD = _open_proc('/proc/loadavg')
+
+# Limits concurrent pgrep fallbacks when many requests miss the cache at once
+_pgrep_slots = threading.BoundedSemaphore(1)
+
+def _pid_running(name):
+    """Return True if any process command line contains name"""
+    if not os.path.isdir('/proc'):
+        # No procfs (e.g. macOS) - fall back to pgrep's exit status
+        with _pgrep_slots:
+            proc = subprocess.Popen(['pgrep', '-f', name],
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+            return proc.wait() == 0
+
+    needle = name.encode()
+    own_pid = str(os.getpid())
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or pid == own_pid:
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if needle in f.read():
+                    return True
+        except OSError:
+            pass
+    return False
+
+# Short-lived cache for probes the dashboard polls every second or two
+_cache = {}
+
+def ttl_cache(ttl):
+    """Memoize a handler method's result for ttl seconds (shared across requests)"""
+    def decorator(fn):
+        key = fn.__name__
+        # Held across check/compute/store so only one thread refreshes an
+        # expired entry while the others wait for its result
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(self):
+            with lock:
+                entry = _cache.get(key)
+                if entry and time.monotonic() - entry[0] < ttl:
+                    return entry[1]
+                result = fn(self)
+                _cache[key] = (time.monotonic(), result)
+                return result
+        return wrapper
+    return decorator
+
+# API responses smaller than this are sent uncompressed
+GZIP_MIN_SIZE = 512
+
+def accepts_gzip(accept_encoding):
+    """Return True if an Accept-Encoding header allows gzip (q > 0)"""
+    gzip_q = None
+    wildcard_q = None
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', 'x-gzip', '*'):
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == '*':
+            wildcard_q = q
+        else:
+            gzip_q = q
+    # An explicit gzip entry takes precedence over the wildcard
+    q = gzip_q if gzip_q is not None else wildcard_q
+    return q is not None and q > 0
+
+# Fixed headers for API responses (JSON with CORS)
+_JSON_HEADERS = (b'Content-Type: application/json\r\n'
+                 b'Access-Control-Allow-Origin: *\r\n'
+                 b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+                 b'Access-Control-Allow-Headers: Content-Type\r\n'
+                 b'Vary: Accept-Encoding\r\n')
+
+# Pre-serialized bodies for responses whose content is constant apart from
+# timestamps and load; placeholders are substituted per request
+_STATUS_TEMPLATE = _dumps({
+    'portfolio_value': 127543.21,
+    'portfolio_change': 3421.83,
+    'portfolio_change_percent': 2.76,
+    'active_positions': 8,
+    'trading_mode': 'paper',
+    'ai_confidence': 84.2,
+    'claude_features_enabled': True,
+    'positions': ['BTC', 'ETH', 'ADA', 'SOL', 'MATIC', 'LINK', 'DOT', 'AVAX'],
+    'last_prediction_update': '__TS__',
+    'system_load': '__LOAD__',
+    'timestamp': '__TS__'
+})
+
+_LOGS_TEMPLATE = _dumps({
+    'logs': [
+        {
+            'timestamp': '__HMS__',
+            'level': 'INFO',
+            'message': 'CryptoClaude system running normally'
+        },
+        {
+            'timestamp': '__HMS__',
+            'level': 'SUCCESS',
+            'message': 'Claude AI features operational'
+        },
+        {
+            'timestamp': '__HMS__',
+            'level': 'INFO',
+            'message': 'API connections: 6/6 active'
+        }
+    ],
+    'timestamp': '__TS__'
+})
+
+# Request log lines are queued by handler threads and printed by a daemon
+# writer thread, so request latency doesn't depend on stdout
+_log_queue = queue.SimpleQueue()
+_log_writer_lock = threading.Lock()
+_log_writer_pid = None
+_log_writer_thread = None
+
+def _log_writer():
+    while True:
+        item = _log_queue.get()
+        if item is None:
+            return
+        timestamp, format, args = item
+        timestamp = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"[{timestamp}] {format % args}", flush=True)
+
+def _ensure_log_writer():
+    """Start the writer thread once per process (forked workers need their own)"""
+    global _log_writer_pid, _log_writer_thread
+    if _log_writer_pid == os.getpid():
+        return
+    with _log_writer_lock:
+        if _log_writer_pid != os.getpid():
+            _log_writer_thread = threading.Thread(target=_log_writer, daemon=True)
+            _log_writer_thread.start()
+            _log_writer_pid = os.getpid()
+
+def flush_log_writer():
+    """Print any queued log lines and stop this process's writer thread"""
+    global _log_writer_pid
+    with _log_writer_lock:
+        if _log_writer_pid != os.getpid():
+            return
+        _log_queue.put(None)
+        _log_writer_thread.join()
+        _log_writer_pid = None
+
+# Small static files are read once at startup and served from memory
+# (restart the server to pick up edits); larger ones go through sendfile
+STATIC_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_CACHE_MAX_SIZE = 64 * 1024
+STATIC_CACHE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.png',
+                           '.jpg', '.jpeg', '.gif', '.ico', '.woff', '.woff2')
+
+def load_static_cache(root=STATIC_DIR, max_size=STATIC_CACHE_MAX_SIZE):
+    """Map URL paths of web assets under root to (last modified, headers, body)"""
+    cache = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames
+                       if not d.startswith('.') and d != '__pycache__']
+        for filename in filenames:
+            if not filename.lower().endswith(STATIC_CACHE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+                if stat.st_size > max_size:
+                    continue
+                with open(path, 'rb') as f:
+                    body = f.read()
+            except OSError:
+                continue
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            last_modified = datetime.fromtimestamp(
+                stat.st_mtime, timezone.utc).replace(microsecond=0)
+            headers = b'Content-Type: %s\r\nContent-Length: %d\r\nLast-Modified: %s\r\n' % (
+                content_type.encode(), len(body),
+                email.utils.format_datetime(last_modified, usegmt=True).encode())
+            url = '/' + os.path.relpath(path, root).replace(os.sep, '/')
+            cache[url] = (last_modified, headers, body)
+    return cache
+
+_STATIC_CACHE = load_static_cache()
 
 class CryptoClaudeHandler(SimpleHTTPRequestHandler):
+    # Keep connections open between dashboard polls; idle ones are dropped
+    # after the timeout so they don't pin server threads
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+
+    # Set by --quiet to skip per-request log lines (errors are still logged)
+    quiet = False
+
+    # API path -> handler method name
+    API_ROUTES = {
+        '/api/health': 'check_system_health',
+        '/api/status': 'get_system_status',
+        '/api/logs': 'get_recent_logs',
+        '/api/trading/start': 'start_trading',
+        '/api/trading/stop': 'stop_trading',
+        '/api/trading/pause': 'pause_trading',
+        '/api/claude/toggle': 'toggle_claude_features',
+        '/api/predictions/refresh': 'refresh_predictions',
+    }
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=os.path.dirname(__file__), **kwargs)
 
@@ -29,9 +282,83 @@ class CryptoClaudeHandler(SimpleHTTPRequestHandler):
             # Serve static files
             if parsed_path.path == '/':
                 self.path = '/dashboard.html'
-            super().do_GET()
+                parsed_path = urlparse(self.path)
+
+            if not self.send_cached_static(parsed_path.path):
+                super().do_GET()
+
+    def do_HEAD(self):
+        parsed_path = urlparse(self.path)
+        if parsed_path.path == '/':
+            self.path = '/dashboard.html'
+            parsed_path = urlparse(self.path)
+        if not self.send_cached_static(parsed_path.path, head_only=True):
+            super().do_HEAD()
+
+    def send_cached_static(self, path, head_only=False):
+        """Serve path from the static cache; returns False if it isn't cached"""
+        cached = _STATIC_CACHE.get(path)
+        if cached is None:
+            return False
+        last_modified, headers, body = cached
+
+        common = self.common_headers()
+        if self.not_modified_since(last_modified):
+            self.log_request(304)
+            self.wfile.write(b'%s 304 Not Modified\r\n%s\r\n' % (
+                self.protocol_version.encode(), common))
+            return True
+
+        self.log_request(200)
+        self.wfile.write(b'%s 200 OK\r\n%s%s\r\n%s' % (
+            self.protocol_version.encode(), common, headers,
+            b'' if head_only else body))
+        return True
+
+    def not_modified_since(self, last_modified):
+        """Same If-Modified-Since rules as SimpleHTTPRequestHandler.send_head"""
+        if ('If-Modified-Since' not in self.headers
+                or 'If-None-Match' in self.headers):
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=timezone.utc)
+        return ims.tzinfo is timezone.utc and last_modified <= ims
+
+    def handle_one_request(self):
+        # Wait for the next request line here so an idle keep-alive connection
+        # timing out is closed quietly; timeouts mid-request are still logged
+        try:
+            self.rfile.peek(1)
+        except TimeoutError:
+            self.close_connection = True
+            return
+        super().handle_one_request()
+
+    def copyfile(self, source, outputfile):
+        """Send uncached static files with sendfile instead of a read/write loop"""
+        self.connection.sendfile(source)
 
     def do_POST(self):
+        # Consume any request body so it isn't read as the next request
+        if 'Transfer-Encoding' in self.headers:
+            # Bodies aren't used, so don't decode chunks - just drop the
+            # connection after responding
+            self.close_connection = True
+        else:
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                self.send_error(400, "Bad Content-Length")
+                return
+            if length:
+                self.rfile.read(length)
+
         parsed_path = urlparse(self.path)
         if parsed_path.path.startswith('/api/'):
             self.handle_api_request(parsed_path, method='POST')
@@ -41,58 +368,53 @@ class CryptoClaudeHandler(SimpleHTTPRequestHandler):
     def handle_api_request(self, parsed_path, method='GET'):
         """Handle API requests from the dashboard"""
 
-        # Set CORS headers
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-
         response_data = {}
 
         try:
-            if parsed_path.path == '/api/health':
-                response_data = self.check_system_health()
-
-            elif parsed_path.path == '/api/status':
-                response_data = self.get_system_status()
-
-            elif parsed_path.path == '/api/logs':
-                response_data = self.get_recent_logs()
-
-            elif parsed_path.path == '/api/trading/start':
-                response_data = self.start_trading()
-
-            elif parsed_path.path == '/api/trading/stop':
-                response_data = self.stop_trading()
-
-            elif parsed_path.path == '/api/trading/pause':
-                response_data = self.pause_trading()
-
-            elif parsed_path.path == '/api/claude/toggle':
-                response_data = self.toggle_claude_features()
-
-            elif parsed_path.path == '/api/predictions/refresh':
-                response_data = self.refresh_predictions()
-
+            handler_name = self.API_ROUTES.get(parsed_path.path)
+            if handler_name:
+                response_data = getattr(self, handler_name)()
             else:
                 response_data = {'error': 'API endpoint not found', 'status': 'error'}
 
         except Exception as e:
             response_data = {'error': str(e), 'status': 'error'}
 
-        # Send JSON response
-        self.wfile.write(json.dumps(response_data).encode())
-
+        # Encode JSON response (pre-serialized handlers return bytes)
+        body = response_data
+        if not isinstance(body, bytes):
+            body = _dumps(body)
+
+        # Compress larger bodies when the client accepts gzip
+        compressed = (len(body) > GZIP_MIN_SIZE and
+                      accepts_gzip(self.headers.get('Accept-Encoding', '')))
+        if compressed:
+            body = gzip.compress(body, compresslevel=1)
+
+        self.send_json(body, compressed)
+
+    def common_headers(self):
+        """Server and Date headers, as send_response would add them"""
+        return b'Server: %s\r\nDate: %s\r\n' % (
+            self.version_string().encode(), self.date_time_string().encode())
+
+    def send_json(self, body, compressed=False):
+        """Write status line, headers and body with a single write call"""
+        self.log_request(200)
+        head = b'%s 200 OK\r\n%s%s%sContent-Length: %d\r\n\r\n' % (
+            self.protocol_version.encode(),
+            self.common_headers(),
+            _JSON_HEADERS,
+            b'Content-Encoding: gzip\r\n' if compressed else b'',
+            len(body))
+        self.wfile.write(head + body)
+
+    @ttl_cache(2.0)
     def check_system_health(self):
         """Check if CryptoClaude system is running"""
         try:
             # Check for CryptoClaude console process
-            result = subprocess.run(['pgrep', '-f', 'cryptoclaude-console'],
-                                  capture_output=True, text=True)
-
-            is_running = len(result.stdout.strip()) > 0
+            is_running = _pid_running('cryptoclaude-console')
 
             # Check AWS connection (simplified)
             aws_connected = self.check_aws_connection()
@@ -113,40 +435,18 @@ class CryptoClaudeHandler(SimpleHTTPRequestHandler):
 
     def get_system_status(self):
         """Get current system status and metrics"""
-        return {
-            'portfolio_value': 127543.21,
-            'portfolio_change': 3421.83,
-            'portfolio_change_percent': 2.76,
-            'active_positions': 8,
-            'trading_mode': 'paper',
-            'ai_confidence': 84.2,
-            'claude_features_enabled': True,
-            'positions': ['BTC', 'ETH', 'ADA', 'SOL', 'MATIC', 'LINK', 'DOT', 'AVAX'],
-            'last_prediction_update': datetime.now().isoformat(),
-            'system_load': self.get_system_load(),
-            'timestamp': datetime.now().isoformat()
-        }
+        ts = datetime.now().isoformat().encode()
+        return (_STATUS_TEMPLATE
+                .replace(b'"__LOAD__"', _dumps(self.get_system_load()))
+                .replace(b'__TS__', ts))
 
     def get_recent_logs(self):
         """Get recent system logs"""
-        logs = [
-            {
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'level': 'INFO',
-                'message': 'CryptoClaude system running normally'
-            },
-            {
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'level': 'SUCCESS',
-                'message': 'Claude AI features operational'
-            },
-            {
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'level': 'INFO',
-                'message': f'API connections: 6/6 active'
-            }
-        ]
-        return {'logs': logs, 'timestamp': datetime.now().isoformat()}
+        ts = datetime.now().isoformat().encode()
+        # isoformat() is YYYY-MM-DDTHH:MM:SS[.ffffff], so HH:MM:SS is a slice
+        return (_LOGS_TEMPLATE
+                .replace(b'__HMS__', ts[11:19])
+                .replace(b'__TS__', ts))
 
     def start_trading(self):
         """Start trading system"""
@@ -228,42 +528,106 @@ class CryptoClaudeHandler(SimpleHTTPRequestHandler):
                 'timestamp': datetime.now().isoformat()
             }
 
+    @ttl_cache(10.0)
     def check_aws_connection(self):
         """Check AWS Lightsail connection"""
         try:
-            # Simple ping test (replace with actual AWS check)
-            result = subprocess.run(['ping', '-c', '1', '8.8.8.8'],
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except:
+            # Simple connectivity test (replace with actual AWS check)
+            with socket.create_connection(('8.8.8.8', 53), timeout=1):
+                return True
+        except OSError:
             return False
 
+    @ttl_cache(5.0)
     def get_system_uptime(self):
         """Get system uptime"""
         try:
-            with open('/proc/uptime', 'r') as f:
-                uptime_seconds = float(f.readline().split()[0])
-                return int(uptime_seconds)
+            return int(float(os.pread(_UPTIME_FD, 64, 0).split(b' ', 1)[0]))
         except:
             return 0
 
+    @ttl_cache(1.0)
     def get_system_load(self):
         """Get system load average"""
         try:
-            with open('/proc/loadavg', 'r') as f:
-                load_avg = f.readline().split()[:3]
-                return [float(x) for x in load_avg]
+            load_avg = os.pread(_LOADAVG_FD, 128, 0).split(b' ', 3)[:3]
+            return [float(x) for x in load_avg]
         except:
             return [0.0, 0.0, 0.0]
 
+    def log_request(self, code='-', size='-'):
+        """Skip per-request lines when quiet; errors still go to log_message"""
+        if not self.quiet:
+            super().log_request(code, size)
+
     def log_message(self, format, *args):
-        """Override to customize logging"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        message = format % args
-        print(f"[{timestamp}] {message}")
+        """Override to customize logging (formatted and printed off-thread)"""
+        _ensure_log_writer()
+        _log_queue.put((time.time(), format, args))
+
+def default_worker_count():
+    """One worker per CPU where fork is available, else one"""
+    if hasattr(os, 'fork'):
+        return os.cpu_count() or 1
+    return 1
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def fork_workers(httpd, count):
+    """Fork count extra processes serving httpd's already-bound socket"""
+    pids = []
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            # Exit through the finally below on SIGTERM so queued logs are printed
+            signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+            exit_code = 0
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                flush_log_writer()
+                os._exit(exit_code)
+        pids.append(pid)
+    return pids
+
+def watch_workers(pids, live, stopping):
+    """Report workers that die while the server is running"""
+    def watch(pid):
+        _, status = os.waitpid(pid, 0)
+        live.discard(pid)
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code != 0 and not stopping.is_set():
+            print(f"⚠️  Worker {pid} exited with status {exit_code}; "
+                  f"{len(live) + 1} server processes still running")
+
+    watchers = [threading.Thread(target=watch, args=(pid,), daemon=True)
+                for pid in pids]
+    for watcher in watchers:
+        watcher.start()
+    return watchers
+
+def reap_workers(live, watchers, stopping):
+    """Terminate and wait for forked worker processes"""
+    stopping.set()
+    for pid in list(live):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for watcher in watchers:
+        watcher.join()
 
-def start_dashboard_server(port=8080, auto_open=True):
+def start_dashboard_server(port=8080, auto_open=True, workers=None, quiet=False):
     """Start the dashboard web server"""
+    CryptoClaudeHandler.quiet = quiet
+    if workers is None:
+        workers = default_worker_count()
 
     print(f"""
 🚀 CryptoClaude Control Dashboard
@@ -285,9 +649,20 @@ Press Ctrl+C to stop the server
 """)
 
     try:
-        with HTTPServer(('', port), CryptoClaudeHandler) as httpd:
+        # The parent binds the port once and workers share that socket, so a
+        # second instance fails with "address in use" as before
+        with ThreadingHTTPServer(('', port), CryptoClaudeHandler) as httpd:
             print(f"✅ Server started successfully on port {port}")
 
+            children = fork_workers(httpd, workers - 1)
+            live = set(children)
+            stopping = threading.Event()
+            watchers = watch_workers(children, live, stopping)
+            if children:
+                print(f"⚙️  Running {workers} server processes")
+            # Treat SIGTERM like Ctrl+C so the workers get reaped
+            signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
             # Open browser automatically
             if auto_open:
                 threading.Timer(1.0, lambda: webbrowser.open(f'http://localhost:{port}')).start()
@@ -297,11 +672,15 @@ Press Ctrl+C to stop the server
             try:
                 httpd.serve_forever()
             except KeyboardInterrupt:
+                flush_log_writer()
                 print("\n🛑 Server shutdown requested by user")
                 httpd.shutdown()
+            finally:
+                reap_workers(live, watchers, stopping)
+                flush_log_writer()
 
     except OSError as e:
-        if e.errno == 48:  # Address already in use
+        if e.errno == errno.EADDRINUSE:
             print(f"❌ Port {port} is already in use. Try a different port:")
             print(f"   python3 dashboard_server.py --port 8081")
         else:
@@ -317,7 +696,12 @@ if __name__ == '__main__':
                        help='Port to run the server on (default: 8080)')
     parser.add_argument('--no-open', action='store_true',
                        help='Don\'t automatically open browser')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of server processes (default: one per CPU)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Don\'t log individual requests')
 
     args = parser.parse_args()
 
-    start_dashboard_server(port=args.port, auto_open=not args.no_open)
\ No newline at end of file
+    start_dashboard_server(port=args.port, auto_open=not args.no_open,
+                           workers=args.workers, quiet=args.quiet)
\ No newline at end of file
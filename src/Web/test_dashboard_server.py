@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Tests for the CryptoClaude dashboard server
+Run with: python3 -m unittest test_dashboard_server
+"""
+
+import gzip
+import http.client
+import importlib.util
+import json
+import socket
+import sys
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+import dashboard_server
+
+
+def load_with_stdlib_json():
+    """Import a separate copy of dashboard_server with orjson/ujson hidden"""
+    spec = importlib.util.spec_from_file_location('dashboard_server_stdlib_json',
+                                                  dashboard_server.__file__)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {'orjson': None, 'ujson': None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+class DashboardServerTestCase(unittest.TestCase):
+    """Runs a dashboard server on an ephemeral port for each test"""
+
+    server_module = dashboard_server
+
+    def setUp(self):
+        handler = self.server_module.CryptoClaudeHandler
+        patcher = mock.patch.object(handler, 'quiet', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.conn = http.client.HTTPConnection('127.0.0.1',
+                                               self.httpd.server_address[1])
+
+    def tearDown(self):
+        self.conn.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get(self, path, headers=None):
+        self.conn.request('GET', path, headers=headers or {})
+        response = self.conn.getresponse()
+        return response, response.read()
+
+
+class TemplateResponseTest(DashboardServerTestCase):
+    """Pre-serialized /api/status and /api/logs must decode to the full payload"""
+
+    def test_status_is_valid_json(self):
+        response, body = self.get('/api/status')
+        data = json.loads(body)
+        self.assertEqual(data['positions'][0], 'BTC')
+        self.assertEqual(len(data['system_load']), 3)
+        for value in data['system_load']:
+            self.assertIsInstance(value, float)
+        self.assertEqual(data['last_prediction_update'], data['timestamp'])
+        self.assertRegex(data['timestamp'], r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+    def test_logs_are_valid_json(self):
+        response, body = self.get('/api/logs')
+        data = json.loads(body)
+        self.assertEqual(len(data['logs']), 3)
+        for entry in data['logs']:
+            self.assertRegex(entry['timestamp'], r'^\d{2}:\d{2}:\d{2}$')
+            self.assertEqual(entry['timestamp'], data['timestamp'][11:19])
+        self.assertEqual(data['logs'][2]['message'], 'API connections: 6/6 active')
+
+
+class ApiHeadersTest(DashboardServerTestCase):
+    def test_api_and_static_responses_send_server_and_date(self):
+        api_response, _ = self.get('/api/logs')
+        static_response, _ = self.get('/dashboard.html')
+        for name in ('Server', 'Date'):
+            self.assertIsNotNone(api_response.getheader(name))
+        self.assertEqual(api_response.getheader('Server'),
+                         static_response.getheader('Server'))
+
+
+class StdlibJsonTemplateResponseTest(TemplateResponseTest):
+    """Same checks with the stdlib json fallback (different separators)"""
+
+    server_module = load_with_stdlib_json()
+
+    def test_fallback_encoder_is_in_use(self):
+        # json.dumps puts a space after ':', orjson doesn't
+        self.assertIn(b'"system_load": "__LOAD__"', self.server_module._STATUS_TEMPLATE)
+
+
+class TtlCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        test = self
+
+        class Probe:
+            @dashboard_server.ttl_cache(5.0)
+            def ttl_cache_test_probe(self):
+                test.release.wait(5)
+                test.calls += 1
+                return test.calls
+
+        self.probe = Probe()
+        self.addCleanup(dashboard_server._cache.pop, 'ttl_cache_test_probe', None)
+
+    def test_fresh_entry_is_reused_and_expired_entry_recomputed(self):
+        with mock.patch.object(dashboard_server.time, 'monotonic') as monotonic:
+            monotonic.return_value = 100.0
+            self.assertEqual(self.probe.ttl_cache_test_probe(), 1)
+            monotonic.return_value = 104.9
+            self.assertEqual(self.probe.ttl_cache_test_probe(), 1)
+            monotonic.return_value = 105.0
+            self.assertEqual(self.probe.ttl_cache_test_probe(), 2)
+        self.assertEqual(self.calls, 2)
+
+    def test_concurrent_callers_share_one_refresh(self):
+        self.release.clear()
+        results = []
+        threads = [threading.Thread(
+                       target=lambda: results.append(self.probe.ttl_cache_test_probe()))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [1] * 10)
+
+
+class AcceptsGzipTest(unittest.TestCase):
+    def test_plain_and_weighted_gzip(self):
+        self.assertTrue(dashboard_server.accepts_gzip('gzip'))
+        self.assertTrue(dashboard_server.accepts_gzip('deflate, gzip;q=0.5'))
+        self.assertTrue(dashboard_server.accepts_gzip('GZIP ; Q=1'))
+
+    def test_refusals(self):
+        self.assertFalse(dashboard_server.accepts_gzip(''))
+        self.assertFalse(dashboard_server.accepts_gzip('br, deflate'))
+        self.assertFalse(dashboard_server.accepts_gzip('gzip;q=0'))
+        self.assertFalse(dashboard_server.accepts_gzip('gzip;q=0.000'))
+
+    def test_wildcard(self):
+        self.assertTrue(dashboard_server.accepts_gzip('*'))
+        self.assertFalse(dashboard_server.accepts_gzip('*;q=0'))
+        self.assertFalse(dashboard_server.accepts_gzip('*, gzip;q=0'))
+        self.assertTrue(dashboard_server.accepts_gzip('*;q=0, gzip'))
+
+
+class GzipResponseTest(DashboardServerTestCase):
+    def test_compresses_large_body_when_accepted(self):
+        with mock.patch.object(dashboard_server, 'GZIP_MIN_SIZE', 100):
+            response, body = self.get('/api/logs', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+        self.assertEqual(int(response.getheader('Content-Length')), len(body))
+        self.assertIn('logs', json.loads(gzip.decompress(body)))
+
+    def test_no_compression_when_refused(self):
+        with mock.patch.object(dashboard_server, 'GZIP_MIN_SIZE', 100):
+            response, body = self.get('/api/logs', {'Accept-Encoding': 'gzip;q=0'})
+        self.assertIsNone(response.getheader('Content-Encoding'))
+        self.assertIn('logs', json.loads(body))
+
+    def test_no_compression_below_threshold(self):
+        response, body = self.get('/api/logs', {'Accept-Encoding': 'gzip'})
+        self.assertIsNone(response.getheader('Content-Encoding'))
+        self.assertIn('logs', json.loads(body))
+
+
+class StaticCacheTest(DashboardServerTestCase):
+    def test_only_web_assets_are_cached(self):
+        self.assertIn('/dashboard.html', dashboard_server._STATIC_CACHE)
+        self.assertNotIn('/dashboard_server.py', dashboard_server._STATIC_CACHE)
+
+    def test_get_and_head_send_the_same_headers(self):
+        response, body = self.get('/')
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body)
+        get_headers = dict(response.getheaders())
+
+        self.conn.request('HEAD', '/dashboard.html')
+        response = self.conn.getresponse()
+        self.assertEqual(response.read(), b'')
+        head_headers = dict(response.getheaders())
+
+        for name in ('Content-Type', 'Content-Length', 'Last-Modified', 'Server'):
+            self.assertEqual(get_headers[name], head_headers[name])
+        self.assertIn('Date', head_headers)
+
+    def test_if_modified_since(self):
+        response, _ = self.get('/dashboard.html')
+        last_modified = response.getheader('Last-Modified')
+
+        response, body = self.get('/dashboard.html',
+                                  {'If-Modified-Since': last_modified})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b'')
+
+        response, body = self.get('/dashboard.html',
+                                  {'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body)
+
+
+class PostBodyTest(DashboardServerTestCase):
+    def raw_request(self, data):
+        """Send raw bytes and return everything read until the server closes"""
+        with socket.create_connection(self.httpd.server_address, timeout=5) as sock:
+            sock.sendall(data)
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+
+    def test_body_is_drained_before_next_request(self):
+        response = self.raw_request(
+            b'POST /api/trading/start HTTP/1.1\r\nHost: x\r\nContent-Length: 3\r\n\r\nabc'
+            b'GET /api/logs HTTP/1.1\r\nHost: x\r\n\r\n')
+        self.assertEqual(response.count(b'HTTP/1.1 200 OK'), 2)
+
+    def test_bad_content_length_is_rejected(self):
+        for length in (b'abc', b'-1'):
+            response = self.raw_request(
+                b'POST /api/trading/start HTTP/1.1\r\nHost: x\r\nContent-Length: '
+                + length + b'\r\n\r\n')
+            self.assertTrue(response.startswith(b'HTTP/1.1 400'), response[:40])
+
+    def test_chunked_body_closes_connection(self):
+        response = self.raw_request(
+            b'POST /api/trading/start HTTP/1.1\r\nHost: x\r\n'
+            b'Transfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n'
+            b'GET /api/logs HTTP/1.1\r\nHost: x\r\n\r\n')
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK'))
+        self.assertEqual(response.count(b'HTTP/1.1'), 1)
+        self.assertNotIn(b'400', response)
+
+
+class KeepAliveTimeoutTest(DashboardServerTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(dashboard_server.CryptoClaudeHandler, 'timeout', 0.2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def wait_for_close(self, sock):
+        sock.settimeout(5)
+        while sock.recv(65536):
+            pass
+
+    def test_idle_connection_closes_without_logging(self):
+        with mock.patch.object(dashboard_server.CryptoClaudeHandler,
+                               'log_message') as log_message:
+            with socket.create_connection(self.httpd.server_address) as sock:
+                self.wait_for_close(sock)
+        self.assertFalse(log_message.called)
+
+    def test_timeout_mid_request_is_logged(self):
+        with mock.patch.object(dashboard_server.CryptoClaudeHandler,
+                               'log_message') as log_message:
+            with socket.create_connection(self.httpd.server_address) as sock:
+                sock.sendall(b'GET /api/logs HTTP/1.1\r\n')
+                self.wait_for_close(sock)
+        self.assertIn('timed out', log_message.call_args[0][0])
+
+
+class QuietLoggingTest(DashboardServerTestCase):
+    def test_quiet_skips_requests_but_keeps_errors(self):
+        with mock.patch.object(dashboard_server.CryptoClaudeHandler,
+                               'log_message') as log_message:
+            self.get('/api/logs')
+            self.assertFalse(log_message.called)
+            self.get('/missing')
+        self.assertEqual(log_message.call_count, 1)
+        self.assertIn('code %d', log_message.call_args[0][0])
+
+    def test_flush_prints_queued_lines(self):
+        dashboard_server.CryptoClaudeHandler.quiet = False
+        with mock.patch('builtins.print') as fake_print:
+            self.get('/api/logs')
+            dashboard_server.flush_log_writer()
+        self.assertIn('/api/logs', fake_print.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()